@@ -5,17 +5,195 @@ import ast
 import logging
 import os
 import re
+from bisect import bisect_right
+from collections.abc import Callable, Generator
+from functools import lru_cache
+from operator import methodcaller
+from typing import Any, TypeGuard
 
 # third-party
 import black
 import isort
 from black.report import NothingChanged
 
-from .render.render import Render
-
 # get logger
 _logger = logging.getLogger(__name__.split('.', maxsplit=1)[0])
 
+# regex constructs that behave differently when a match can see past the end of the line:
+# anchors, lookarounds, and atomic groups/possessive quantifiers (no backtracking)
+_LINE_BOUNDARY_SENSITIVE = ('\\A', '\\Z', '(?=', '(?!', '(?<', '(?>', '*+', '++', '?+', '}+')
+
+# black formatting options used by format_code
+_BLACK_MODE = black.FileMode(line_length=100, string_normalization=False)
+
+# characters that end the literal (static) prefix of a regex pattern
+_REGEX_SPECIAL_CHARS = frozenset('.^$*+?{}[]\\|()')
+
+
+def _iter_lines(contents: str) -> Generator[str, None, None]:
+    """Yield each line of contents without building a list of all lines."""
+    start = 0
+    contents_length = len(contents)
+    while start < contents_length:
+        end = contents.find('\n', start)
+        if end == -1:
+            end = contents_length
+        yield contents[start:end]
+        start = end + 1
+
+
+def _is_literal(pattern: re.Pattern | str | None) -> TypeGuard[str]:
+    """Return True if the pattern is a plain string without any regex special characters."""
+    return isinstance(pattern, str) and _REGEX_SPECIAL_CHARS.isdisjoint(pattern)
+
+
+def _literal_prefix(pattern: re.Pattern | str) -> str:
+    """Return the literal text that any match of the pattern must start with.
+
+    Leading whitespace is skipped, so any line matching the pattern will satisfy
+    line.lstrip().startswith(prefix). An empty string is returned when no static
+    prefix can be safely determined.
+    """
+    if _is_literal(pattern):
+        return pattern.lstrip()
+
+    pattern = re.compile(pattern)
+    source = pattern.pattern
+    if not isinstance(source, str) or pattern.flags & (re.IGNORECASE | re.VERBOSE) or '|' in source:
+        return ''
+
+    source = source.removeprefix('^').removeprefix(r'\s+').removeprefix(r'\s*')
+    prefix = []
+    for char in source:
+        if char in _REGEX_SPECIAL_CHARS:
+            # a quantifier that allows zero repeats makes the previous character optional
+            if char in '*?{' and prefix:
+                prefix.pop()
+            break
+        prefix.append(char)
+    return ''.join(prefix).lstrip()
+
+
+def _line_matcher(pattern: re.Pattern | str) -> Callable[[str], Any]:
+    """Return a callable that matches the pattern at the start of a line.
+
+    Literal patterns are matched with str.startswith, bypassing the regex engine.
+    """
+    if _is_literal(pattern):
+        return methodcaller('startswith', pattern)
+    return re.compile(pattern).match
+
+
+@lru_cache(maxsize=16)
+def _line_starts(contents: str) -> tuple[int, ...]:
+    """Return the offset of the first character of each line in contents.
+
+    A trailing newline does not start a new line (the same lines as _iter_lines).
+    """
+    contents_length = len(contents)
+    return tuple(
+        offset
+        for offset in (0, *(m.end() for m in re.finditer('\n', contents)))
+        if offset < contents_length
+    )
+
+
+def _line_number(line_starts: tuple[int, ...], offset: int) -> int:
+    """Return the (1-based) line number of the offset, using the offsets from _line_starts."""
+    return bisect_right(line_starts, offset)
+
+
+def _line_start_scanner(pattern: re.Pattern) -> re.Pattern | None:
+    """Return a multiline pattern that finds every line start where the pattern may match.
+
+    None is returned when the pattern can't be scanned across the whole contents.
+    """
+    source = pattern.pattern
+    if not isinstance(source, str) or any(c in source for c in _LINE_BOUNDARY_SENSITIVE):
+        return None
+
+    try:
+        # zero-width lookahead so that a match spanning lines doesn't hide the following lines
+        return re.compile(f'^(?={source})', pattern.flags | re.MULTILINE)
+    except re.error:
+        # inline global flags (e.g., "(?i)") can't be nested in the lookahead
+        return None
+
+
+@lru_cache(maxsize=8)
+def _isort_config(settings_file: str | None) -> isort.Config:
+    """Return the isort config for the provided settings file."""
+    isort_args = {'settings_file': settings_file} if settings_file is not None else {}
+    return isort.Config(**isort_args)  # type: ignore
+
+
+@lru_cache(maxsize=32)
+def _format_code(code: str, settings_file: str | None) -> str:
+    """Return code formatted with black and isort (see CodeOperation.format_code)."""
+    # run black formatter on code
+    try:
+        code = black.format_file_contents(code, fast=False, mode=_BLACK_MODE)
+    except ValueError as ex:
+        _logger.exception('Formatting of code with black failed.')
+        raise RuntimeError(f'Formatting of code with black failed {ex}.') from ex
+    except NothingChanged:
+        pass
+
+    # run isort on code
+    try:
+        code = isort.code(code, config=_isort_config(settings_file))
+    except Exception as ex:
+        _logger.exception('Formatting of code with isort failed.')
+        raise RuntimeError(f'Formatting of code with isort failed {ex}.') from ex
+
+    return code
+
+
+@lru_cache(maxsize=32)
+def _unparse_lines(code: str) -> tuple[str, ...]:
+    """Return the normalized (parsed and unparsed) lines of the provided code."""
+    return tuple(ast.unparse(ast.parse(code)).split('\n'))
+
+
+@lru_cache(maxsize=256)
+def _find_line_in_code(
+    needle: re.Pattern | str,
+    code: str,
+    trigger_start: re.Pattern | str | None,
+    trigger_stop: re.Pattern | str | None,
+    use_ast: bool,
+) -> str | None:
+    """Return matching line of code (see CodeOperation.find_line_in_code).
+
+    Results are cached, so repeated searches of the same code are not rescanned.
+    """
+    lines = _unparse_lines(code) if use_ast else _iter_lines(code)
+
+    # build the pattern matchers once, outside of the line loop
+    match_needle = _line_matcher(needle)
+    match_trigger_start = _line_matcher(trigger_start) if trigger_start is not None else None
+    match_trigger_stop = _line_matcher(trigger_stop) if trigger_stop is not None else None
+    needle_prefix = _literal_prefix(needle)
+
+    magnet_on = not trigger_start
+    for line in lines:
+        stripped_line = line.lstrip()
+        if stripped_line[:1] not in ("'", '"'):
+            # Find class before looking for needle
+            if match_trigger_start is not None and match_trigger_start(line):
+                magnet_on = True
+                continue
+
+            # find need now that class definition is found (cheap prefix check first)
+            if magnet_on and stripped_line.startswith(needle_prefix) and match_needle(line):
+                line = line.strip()
+                return line
+
+            # break if needle not found before next class definition
+            if magnet_on and match_trigger_stop is not None and match_trigger_stop(line):
+                break
+    return None
+
 
 class CodeOperation:
     """TcEx FrameWork Code Operations"""
@@ -26,6 +204,7 @@ class CodeOperation:
         code: str,
         trigger_start: re.Pattern | str | None = None,
         trigger_stop: re.Pattern | str | None = None,
+        use_ast: bool = True,
     ) -> str | None:
         """Return matching line of code in a class definition.
 
@@ -34,28 +213,16 @@ class CodeOperation:
             code: The contents of the Python file to search.
             trigger_start: The regex pattern to use to trigger the search.
             trigger_stop: The regex pattern to use to stop the search.
-        """
-        magnet_on = not trigger_start
-        for line in ast.unparse(ast.parse(code)).split('\n'):
-            if line.lstrip()[:1] not in ("'", '"'):
-                # Find class before looking for needle
-                if trigger_start is not None and re.match(trigger_start, line):
-                    magnet_on = True
-                    continue
+            use_ast: If True, search the normalized (unparsed) code, otherwise search the raw lines.
 
-                # find need now that class definition is found
-                if magnet_on is True and re.match(needle, line):
-                    line = line.strip()
-                    return line
-
-                # break if needle not found before next class definition
-                if trigger_stop is not None and re.match(trigger_stop, line) and magnet_on is True:
-                    break
-        return None
+        Results are cached by code and pattern, so the same code can be searched for many
+        needles without being rescanned.
+        """
+        return _find_line_in_code(needle, code, trigger_start, trigger_stop, bool(use_ast))
 
     @staticmethod
     def find_line_number(
-        needle: str,
+        needle: re.Pattern | str,
         contents: str,
         trigger_start: re.Pattern | str | None = None,
         trigger_stop: re.Pattern | str | None = None,
@@ -68,46 +235,96 @@ class CodeOperation:
             trigger_start: The regex pattern to use to trigger the search.
             trigger_stop: The regex pattern to use to stop the search.
         """
+        # build the pattern matchers once, outside of the line loop
+        match_needle = _line_matcher(needle)
+        match_trigger_start = _line_matcher(trigger_start) if trigger_start is not None else None
+        match_trigger_stop = _line_matcher(trigger_stop) if trigger_stop is not None else None
+
+        # skip the line scan when the static prefix of the needle or trigger is not in contents
+        needle_prefix = _literal_prefix(needle)
+        if needle_prefix not in contents:
+            return None
+        if trigger_start is not None and _literal_prefix(trigger_start) not in contents:
+            return None
+
         magnet_on = not trigger_start
-        for line_number, line in enumerate(contents.split('\n'), start=1):
-            if line.strip():
+        for line_number, line in enumerate(_iter_lines(contents), start=1):
+            stripped_line = line.lstrip()
+            if stripped_line:
                 # set magnet_on to True if trigger_start is found
-                if trigger_start is not None and re.match(trigger_start, line):
+                if match_trigger_start is not None and match_trigger_start(line):
                     magnet_on = True
                     continue
 
-                # find needle now that trigger is found
-                if magnet_on is True and re.match(needle, line):
+                # find needle now that trigger is found (cheap prefix check first)
+                if magnet_on and stripped_line.startswith(needle_prefix) and match_needle(line):
                     return line_number
 
                 # break if trigger_stop is defined and found
-                if trigger_stop is not None and re.match(trigger_stop, line) and magnet_on is True:
+                if magnet_on and match_trigger_stop is not None and match_trigger_stop(line):
                     break
         return None
 
     @staticmethod
-    def format_code(_code):
-        """Return formatted code."""
-        # run black formatter on code
-        mode = black.FileMode(line_length=100, string_normalization=False)
-        try:
-            _code = black.format_file_contents(_code, fast=False, mode=mode)
-        except ValueError as ex:
-            _logger.exception('Formatting of code with black failed.')
-            Render.panel.failure(f'Formatting of code with black failed {ex}.')
-        except NothingChanged:
-            pass
-
-        # run isort on code
-        try:
-            isort_args = (
-                {'settings_file': 'pyproject.toml'} if os.path.isfile('pyproject.toml') else {}
+    def find_lines_batch(
+        contents: str,
+        patterns: list[re.Pattern | str],
+    ) -> dict[re.Pattern | str, list[int]]:
+        """Return the line numbers of all lines matching each of the provided patterns.
+
+        Each pattern is matched at the start of every line, including blank lines (unlike
+        find_line_number). Candidate lines are found with a single regex pass over the whole
+        contents per pattern and then confirmed against the line itself.
+
+        Args:
+            contents: The contents (haystack) to search
+            patterns: The regex patterns to search for.
+        """
+        line_starts = _line_starts(contents)
+
+        results: dict[re.Pattern | str, list[int]] = {}
+        for pattern in patterns:
+            pattern_re = re.compile(pattern)
+            scanner_re = _line_start_scanner(pattern_re)
+            candidates = (
+                [m.start() for m in scanner_re.finditer(contents) if m.start() < len(contents)]
+                if scanner_re is not None
+                else line_starts
             )
-            isort_config = isort.Config(**isort_args)  # type: ignore
-            _code = isort.code(_code, config=isort_config)
-        except Exception as ex:
-            _logger.exception('Formatting of code with isort failed.')
-            # _logger.debug(_code)
-            Render.panel.failure(f'Formatting of code with isort failed {ex}.')
-
-        return _code
+
+            line_numbers = []
+            for start in candidates:
+                end = contents.find('\n', start)
+                # a match against the whole contents may span lines, confirm it within the line
+                if pattern_re.match(contents[start : end if end != -1 else None]):
+                    line_numbers.append(_line_number(line_starts, start))
+            results[pattern] = line_numbers
+        return results
+
+    @staticmethod
+    def format_code(_code: str) -> str:
+        """Return formatted code.
+
+        Results are cached, so formatting the same code again skips black and isort.
+
+        Raises:
+            RuntimeError: If formatting of the code with black or isort fails.
+        """
+        settings_file = (
+            os.path.abspath('pyproject.toml') if os.path.isfile('pyproject.toml') else None
+        )
+        return _format_code(_code, settings_file)
+
+    @staticmethod
+    def format_code_batch(codes: list[str]) -> list[str]:
+        """Return formatted code for each of the provided code strings.
+
+        Code that fails to format is returned unchanged (the failure is logged).
+        """
+        formatted_codes = []
+        for code in codes:
+            try:
+                formatted_codes.append(CodeOperation.format_code(code))
+            except RuntimeError:
+                formatted_codes.append(code)
+        return formatted_codes
@@ -0,0 +1,64 @@
+"""TcEx Framework Module"""
+
+# standard library
+import re
+
+# third-party
+import pytest
+
+from ..code_operation import CodeOperation, _literal_prefix
+
+
+class TestCodeOperation:
+    """Test Suite"""
+
+    @pytest.mark.parametrize(
+        'contents,pattern,expected',
+        [
+            ('class Foo:\n    pass\nclass Bar:\n', 'class ', [1, 3]),
+            ('    x = 1\n\n    def foo():\n', r'\s+def ', [3]),
+            # lookahead must not see past the end of the line
+            ('classy\nfoo\n', r'classy(?!\s)', [1]),
+            # a trailing newline does not start another line
+            ('a\n\nb\n', r'\s*$', [2]),
+            ('', '', []),
+        ],
+    )
+    def test_find_lines_batch(self, contents: str, pattern: str, expected: list[int]):
+        """Test Case"""
+        assert CodeOperation.find_lines_batch(contents, [pattern]) == {pattern: expected}
+
+    def test_find_line_in_code_use_ast_cache_key(self):
+        """Test Case"""
+        code = 'class Foo:\n    x = 1  # c\n'
+
+        # a truthy non-bool flag must not share a cache entry with use_ast=True
+        assert CodeOperation.find_line_in_code(r'\s+x', code, use_ast=1) == 'x = 1'  # type: ignore
+        assert CodeOperation.find_line_in_code(r'\s+x', code, use_ast=False) == 'x = 1  # c'
+        assert CodeOperation.find_line_in_code(r'\s+x', code, use_ast=True) == 'x = 1'
+
+    @pytest.mark.parametrize(
+        'pattern,expected,lines',
+        [
+            (r'\s+x', 'x', ['  x = 1', '\tx']),
+            (r'^\s*def', 'def', ['def foo():', '    def bar():']),
+            (r'\s* name', 'name', [' name', '    name = 1']),
+            ('ab?', 'a', ['a', 'ab']),
+            ('abc+', 'abc', ['abc', 'abccc']),
+            ('a{0,2}b', '', ['b', 'aab']),
+            ('(?i)abc', '', ['ABC', 'abc']),
+            (re.compile('abc', re.IGNORECASE), '', ['ABC']),
+            (re.compile('a b', re.VERBOSE), '', ['ab']),
+            ('abc|def', '', ['abc', 'def']),
+            ('    class Foo', 'class Foo', ['    class Foo:']),
+        ],
+    )
+    def test_literal_prefix(self, pattern: re.Pattern | str, expected: str, lines: list[str]):
+        """Test Case"""
+        prefix = _literal_prefix(pattern)
+        assert prefix == expected
+
+        # every line the pattern matches must pass the prefix check used by the line scans
+        for line in lines:
+            assert re.match(pattern, line)
+            assert line.lstrip().startswith(prefix)
@@ -0,0 +1,60 @@
+"""TcEx Framework Module"""
+
+# standard library
+from typing import Any
+
+# third-party
+import pytest
+
+from ..util import Util
+
+
+class TestUtil:
+    """Test Suite"""
+
+    @pytest.mark.parametrize(
+        'value,expected',
+        [
+            ('1.2.3.4', True),
+            ('255.255.255.255', True),
+            ('::1', True),
+            ('2001:db8::8a2e:370:7334', True),
+            ('::ffff:1.2.3.4', True),
+            ('fe80::1%eth0', True),
+            (16909060, True),
+            ('01.2.3.4', False),
+            ('1.2.3', False),
+            ('256.1.1.1', False),
+            ('1::2::3', False),
+            ('1.2.3.4/24', False),
+            ('1.2.3.4%eth0', False),
+            ('foo', False),
+            ('', False),
+            (None, False),
+        ],
+    )
+    def test_is_ip(self, value: Any, expected: bool):
+        """Test Case"""
+        assert Util.is_ip(value) is expected
+
+    @pytest.mark.parametrize(
+        'value,expected',
+        [
+            ('1.2.3.4/24', True),
+            ('2001:db8::/32', True),
+            ('::ffff:1.2.3.4/128', True),
+            ('fe80::1%eth0/64', True),
+            ('1.2.3.4/255.255.255.0', True),
+            ('1.2.3.4/0.0.0.255', True),
+            ('1.2.3.4', False),
+            ('01.2.3.4/24', False),
+            ('1.2.3.4/33', False),
+            ('foo/24', False),
+            (16909060, False),
+            (('1.2.3.4', 24), False),
+            (None, False),
+        ],
+    )
+    def test_is_cidr(self, value: Any, expected: bool):
+        """Test Case"""
+        assert Util.is_cidr(value) is expected
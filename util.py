@@ -3,6 +3,7 @@
 # standard library
 import ipaddress
 import re
+import socket
 from typing import Any
 
 from .aes_operation import AesOperation
@@ -10,6 +11,9 @@ from .datetime_operation import DatetimeOperation
 from .string_operation import StringOperation
 from .variable import Variable
 
+# runs of ASCII digits in an ASN (e.g., AS12345)
+_ASN_DIGITS_RE = re.compile('[0-9]+')
+
 
 class Util(AesOperation, DatetimeOperation, StringOperation, Variable):
     """TcEx Utilities Class"""
@@ -22,30 +26,49 @@ class Util(AesOperation, DatetimeOperation, StringOperation, Variable):
         and for lists with a mix of lists and single values
         """
         flat_list = []
-        for sublist in lst:
-            if isinstance(sublist, list):
-                for item in Util.flatten_list(sublist):
-                    flat_list.append(item)
+        # walk nested lists with an explicit stack of iterators instead of recursion
+        stack = [iter(lst)]
+        while stack:
+            for item in stack[-1]:
+                if isinstance(item, list):
+                    stack.append(iter(item))
+                    break
+                flat_list.append(item)
             else:
-                flat_list.append(sublist)
+                stack.pop()
         return flat_list
 
     @staticmethod
     def is_cidr(possible_cidr_range: str) -> bool:
         """Return True if the provided value is a valid CIDR block."""
+        # a CIDR string always has a prefix length/netmask, skip parsing when it's missing
+        if not isinstance(possible_cidr_range, str) or '/' not in possible_cidr_range:
+            return False
+
         try:
-            ipaddress.ip_address(possible_cidr_range)
+            ipaddress.ip_interface(possible_cidr_range)
         except ValueError:
-            try:
-                ipaddress.ip_interface(possible_cidr_range)
-            except Exception:
-                return False
-            return True
-        return False
+            return False
+        return True
 
     @staticmethod
     def is_ip(possible_ip: str) -> bool:
         """Return True if the provided value is a valid IP address."""
+        if isinstance(possible_ip, str):
+            # an IPv4 or IPv6 string always has a "." or ":", skip parsing when neither is present
+            if '.' not in possible_ip and ':' not in possible_ip:
+                return False
+
+            # inet_pton doesn't support IPv6 scope ids (e.g., fe80::1%eth0), use ipaddress
+            if '%' not in possible_ip:
+                # validate with the libc parser, avoiding the pure Python ipaddress objects
+                family = socket.AF_INET6 if ':' in possible_ip else socket.AF_INET
+                try:
+                    socket.inet_pton(family, possible_ip)
+                except (OSError, ValueError):
+                    return False
+                return True
+
         try:
             ipaddress.ip_address(possible_ip)
         except ValueError:
@@ -67,22 +90,31 @@ class Util(AesOperation, DatetimeOperation, StringOperation, Variable):
             mask_char: The character to use in the mask.
             mask_char_count: How many mask character to insert (obscure cred length).
         """
+        if not isinstance(cred, str):
+            return cred
+
         visible = max(visible, 1)
-        if isinstance(cred, str):
-            mask_char = mask_char or '*'
-            if cred is not None and len(cred) >= visible * 2:
-                cred = f'{cred[:visible]}{mask_char * mask_char_count}{cred[-visible:]}'
-        return cred
+        if len(cred) < visible * 2:
+            return cred
+        return cred[:visible] + (mask_char or '*') * mask_char_count + cred[-visible:]
 
     @staticmethod
     def remove_none(dict_: dict[Any, Any | None]) -> dict[Any, Any]:
-        """Remove any mapping from a single level dict with a None value."""
+        """Remove any mapping from a single level dict with a None value.
+
+        If the dict has no None values it is returned as is (not a copy).
+        """
+        if all(v is not None for v in dict_.values()):
+            return dict_
         return {k: v for k, v in dict_.items() if v is not None}
 
     @staticmethod
     def standardize_asn(asn: str) -> str:
         """Return the ASN formatted for ThreatConnect."""
-        numbers = re.findall('[0-9]+', asn)
+        if asn.isascii() and asn.isdigit():
+            return f'ASN{asn}'
+
+        numbers = _ASN_DIGITS_RE.findall(asn)
         if len(numbers) == 1:
             asn = f'ASN{numbers[0]}'
         return asn